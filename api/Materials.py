@@ -1,88 +1,194 @@
-# Tilemap Demo
 import pygame as pg
-import sys
 from settings import *
-from sprites import *
+from assets import Assets
 
 
-class Game:
-    def __init__(self):
-        pg.init()
-        self.screen = pg.display.set_mode((WIDTH, HEIGHT))
-        pg.display.set_caption(TITLE)
+class GlyphAtlas:
+    # Every printable ASCII glyph of one font and size rendered once, in
+    # white, into a single surface. Drawing text is then one Surface.blits
+    # call with an area per character instead of a Font.render per string.
+    # Each colour is a tinted copy kept in the assets' LRU of variants.
+    CHARS = "".join(chr(code) for code in range(32, 127))
+
+    def __init__(self, font, assets, antialias=True):
+        self.font = font
+        self.assets = assets
+        self.antialias = antialias
+        self.height = font.get_linesize()
+        self.areas = {}
+        self.advances = {}
+        self.extra = {}
+        glyphs = [font.render(char, antialias, WHITE) for char in self.CHARS]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        height = max(glyph.get_height() for glyph in glyphs)
+        self.surface = pg.Surface((width, height), pg.SRCALPHA)
+        x = 0
+        for char, glyph in zip(self.CHARS, glyphs):
+            self.surface.blit(glyph, (x, 0))
+            self.areas[char] = pg.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            self.advances[char] = font.size(char)[0]
+            x += glyph.get_width()
+        if pg.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+
+    def glyph(self, char):
+        # Characters outside the atlas are rendered on first use and kept
+        if char not in self.extra:
+            self.extra[char] = self.font.render(char, self.antialias, WHITE)
+            self.advances[char] = self.font.size(char)[0]
+        return self.extra[char]
+
+    def tinted(self, color, char=None):
+        # The atlas, or one extra glyph, multiplied by color
+        source = self.surface if char is None else self.glyph(char)
+        color = tuple(color)
+        if color == WHITE:
+            return source
+
+        def make():
+            surface = source.copy()
+            surface.fill(color, special_flags=pg.BLEND_RGBA_MULT)
+            return surface
+
+        return self.assets.variant(("glyphs", self.font, self.antialias, char, color), make)
+
+    def blits(self, text, x, y, color=WHITE):
+        # (source, dest, area) triples for Surface.blits
+        surface = self.tinted(color)
+        sequence = []
+        for char in text:
+            area = self.areas.get(char)
+            if area is None:
+                sequence.append((self.tinted(color, char), (x, y), None))
+            elif char != " ":
+                sequence.append((surface, (x, y), area))
+            x += self.advances[char]
+        return sequence
+
+    def size(self, text):
+        width = 0
+        for char in text:
+            if char not in self.advances:
+                self.glyph(char)
+            width += self.advances[char]
+        return width, self.height
+
+    def draw(self, surface, text, x, y, color=WHITE):
+        surface.blits(self.blits(text, x, y, color), doreturn=False)
+
+
+class Paper:
+    # Text console window. The buffer is drawn line by line from a
+    # scrolled position, each line kept as a surface until its text changes.
+    def __init__(self, size, fps, caption, font=PAPER_FONT):
+        self.size = size
+        self.fps = fps
+        self.caption = caption
+        self.font = font
+        self.assets = Assets()
+        self.buffer = ""
+        self.running = False
+        self.screen = None
+        self.scroll = 0
+        self.atlases = {}
+        self.lines = []
+        self.writer = None
+
+    def init(self):
+        pg.display.init()
+        pg.font.init()
+        self.screen = pg.display.set_mode(self.size)
+        pg.display.set_caption(self.caption)
         self.clock = pg.time.Clock()
-        pg.key.set_repeat(500, 100)
-        self.load_data()
-
-    def load_data(self):
-        pass
-
-    def new(self):
-        # Initialize all variables
-        self.all_sprites = pg.sprite.Group()
-        self.walls = pg.sprite.Group()
-        self.player = Player(self, 10, 10)
-        for x in range(10, 20):
-            Wall(self, x, 5)
-
-    def run(self):
-        # game loop - set self.playing = False to end game
-        self.playing = True
-        while self.playing:
-            self.dt = self.clock.tick(FPS) / 1000
-            self.events()
-            self.update()
-            self.draw()
+        self.running = True
 
-    def quit(self):
-        pg.quit()
-        sys.exit()
+    def print(self, text):
+        self.buffer = text
+
+    def get_buffer(self):
+        return self.buffer
+
+    def write(self, line, writer):
+        # Reveal line after the buffer with a WritingAs, advanced by read()
+        self.writer = writer
+        return writer.play(self.buffer, line, self.print)
+
+    def atlas(self, size):
+        atlas = self.atlases.get(size)
+        if atlas is None:
+            atlas = self.atlases[size] = GlyphAtlas(self.assets.font(self.font, size), self.assets)
+        return atlas
 
-    def update(self):
-        # update portion of the game loop
-        self.all_sprites.update()
+    def draw_text(self, text, size, color, x, y):
+        self.atlas(size).draw(self.screen, text, x, y, color)
 
-    def draw_grid(self):
-        for x in range(0, WIDTH, TILESIZE):
-            pg.draw.line(self.screen, LIGHTGREY, (x, 0), (x, HEIGHT))
-        for y in range(0, HEIGHT, TILESIZE):
-            pg.draw.line(self.screen, LIGHTGREY, (0, y), (WIDTH, y))
+    def render_line(self, index, text, atlas):
+        # Reuse the cached surface when the line is unchanged. A line that
+        # only grew, as one being typed out does, gets just its new
+        # characters drawn after the old ones.
+        while len(self.lines) <= index:
+            self.lines.append((None, None))
+        cached, surface = self.lines[index]
+        if cached == text:
+            return surface
+        if cached and text.startswith(cached):
+            start, x = len(cached), atlas.size(cached)[0]
+            width = atlas.size(text)[0]
+            if width > surface.get_width():
+                # Double the width so a typed line is reallocated rarely
+                grown = pg.Surface((max(width, 2 * surface.get_width()), atlas.height), pg.SRCALPHA)
+                grown.blit(surface, (0, 0))
+                surface = grown
+        else:
+            start, x = 0, 0
+            surface = pg.Surface(atlas.size(text), pg.SRCALPHA)
+        atlas.draw(surface, text[start:], x, 0, PAPER_TEXT_COLOR)
+        self.lines[index] = (text, surface)
+        return surface
 
-    def draw(self):
-        self.screen.fill(BGCOLOR)
-        self.draw_grid()
-        self.all_sprites.draw(self.screen)
-        pg.display.flip()
+    def visible_lines(self, atlas):
+        return max((self.size[1] - 2 * PAPER_MARGIN) // atlas.height, 1)
+
+    def scroll_by(self, lines):
+        atlas = self.atlas(PAPER_FONT_SIZE)
+        total = len(self.buffer.split("\n"))
+        self.scroll = max(0, min(self.scroll + lines, total - self.visible_lines(atlas)))
+
+    def draw_buffer(self):
+        atlas = self.atlas(PAPER_FONT_SIZE)
+        lines = self.buffer.split("\n")
+        del self.lines[len(lines):]
+        y = PAPER_MARGIN
+        for index in range(self.scroll, min(self.scroll + self.visible_lines(atlas), len(lines))):
+            self.screen.blit(self.render_line(index, lines[index], atlas), (PAPER_MARGIN, y))
+            y += atlas.height
 
     def events(self):
-        # Catch all events here
         for event in pg.event.get():
             if event.type == pg.QUIT:
-                self.quit()
+                self.running = False
+            if event.type == pg.MOUSEWHEEL:
+                self.scroll_by(-event.y)
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_ESCAPE:
-                    self.quit()
-                if event.key == pg.K_LEFT:
-                    self.player.move(dx=-1)
-                if event.key == pg.K_RIGHT:
-                    self.player.move(dx=1)
-                if event.key == pg.K_UP:
-                    self.player.move(dy=-1)
-                if event.key == pg.K_DOWN:
-                    self.player.move(dy=1)
-
-    def show_start_screen(self):
-        pass
-
-    def show_go_screen(self):
-        pass
-
-
-# Create the game object
-g = Game()
-g.show_start_screen()
-
-while True:
-    g.new()
-    g.run()
-    g.show_go_screen()
+                    self.running = False
+                if event.key == pg.K_PAGEUP:
+                    self.scroll_by(-1)
+                if event.key == pg.K_PAGEDOWN:
+                    self.scroll_by(1)
+                if event.key in (pg.K_SPACE, pg.K_RETURN) and self.writer:
+                    self.writer.skip()
+
+    def read(self):
+        # Event loop, runs until the window is closed
+        if not self.running:
+            self.init()
+        while self.running:
+            dt = self.clock.tick(self.fps) / 1000
+            self.events()
+            if self.writer:
+                self.writer.update(dt)
+            self.screen.fill(PAPER_BGCOLOR)
+            self.draw_buffer()
+            pg.display.flip()
+        pg.quit()
@@ -1,16 +1,55 @@
-import time
+class WritingAs:
+    # Shows a line all at once. Subclasses reveal it over time from
+    # update(dt), called once per frame from the main loop.
+    def play(self, buffer, line, bufferreplace_func):
+        self.buffer = buffer
+        self.line = line
+        self.bufferreplace_func = bufferreplace_func
+        self.shown = len(line)
+        bufferreplace_func(f"{buffer} {line}\n")
+        return line
 
+    @property
+    def done(self):
+        return self.shown >= len(self.line)
 
-class WritingAs:
-    def play(self, line, console):
+    def update(self, dt):
+        return not self.done
+
+    def skip(self):
         pass
 
 
 class WritingAsTypewriter(WritingAs):
+    # Reveals one character every `delay` seconds of game time, so the
+    # loop keeps handling input and drawing while a line types out
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.speed = 1
+
     def play(self, buffer, line, bufferreplace_func):
-        rendered = ""
-        for char in line:
-            rendered += char
-            bufferreplace_func(f"{buffer} {rendered}\n")
-            time.sleep(0.05)
+        self.buffer = buffer
+        self.line = line
+        self.bufferreplace_func = bufferreplace_func
+        self.shown = 0
+        self.elapsed = 0
+        self.speed = 1
         return line
+
+    def update(self, dt):
+        if self.done:
+            return False
+        self.elapsed += dt * self.speed
+        shown = min(int(self.elapsed / self.delay), len(self.line))
+        if shown != self.shown:
+            # One buffer replace per frame however many characters appeared
+            self.shown = shown
+            self.bufferreplace_func(f"{self.buffer} {self.line[:shown]}\n")
+        return not self.done
+
+    def fast_forward(self, speed=4):
+        self.speed = speed
+
+    def skip(self):
+        self.elapsed = (len(self.line) + 1) * self.delay
+        self.update(0)
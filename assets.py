@@ -0,0 +1,74 @@
+import pygame as pg
+from collections import OrderedDict
+from os import path
+from settings import *
+
+ASSETS_FOLDER = path.join(path.dirname(__file__), "assets")
+
+
+class Assets:
+    # Loads each image and font once and hands out the same instance to
+    # everyone who asks. Scaled images and rendered text are derived
+    # variants, kept in a bounded LRU cache since they can be made again.
+    def __init__(self, folder=ASSETS_FOLDER, max_variants=ASSET_CACHE_SIZE):
+        self.folder = folder
+        self.max_variants = max_variants
+        self.images = {}
+        self.fonts = {}
+        self.variants = OrderedDict()
+
+    def path(self, name):
+        return path.join(self.folder, name)
+
+    def convert(self, surface, alpha):
+        # Match the display pixel format so blits skip the conversion,
+        # which is only possible once a display mode is set
+        if pg.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def image(self, name, size=None, alpha=True):
+        key = (name, alpha)
+        image = self.images.get(key)
+        if image is None:
+            image = self.convert(pg.image.load(self.path(name)), alpha)
+            self.images[key] = image
+        if size is None or tuple(size) == image.get_size():
+            return image
+        size = tuple(size)
+        return self.variant(("scaled", name, alpha, size), lambda: pg.transform.smoothscale(image, size))
+
+    def tile(self, color, size=(TILESIZE, TILESIZE)):
+        # Plain coloured surface shared by every sprite of that colour
+        key = ("tile", tuple(color), tuple(size))
+        image = self.images.get(key)
+        if image is None:
+            image = pg.Surface(size)
+            image.fill(color)
+            image = self.images[key] = self.convert(image, False)
+        return image
+
+    def font(self, name, size):
+        # name is a file in the assets folder, or None for pygame's default
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pg.font.get_init():
+                pg.font.init()
+            font = pg.font.Font(name and self.path(name), size)
+            self.fonts[key] = font
+        return font
+
+    def text(self, name, size, text, color, antialias=True):
+        key = ("text", name, size, text, tuple(color), antialias)
+        return self.variant(key, lambda: self.font(name, size).render(text, antialias, color))
+
+    def variant(self, key, make):
+        surface = self.variants.get(key)
+        if surface is not None:
+            self.variants.move_to_end(key)
+            return surface
+        surface = self.variants[key] = make()
+        if len(self.variants) > self.max_variants:
+            self.variants.popitem(last=False)
+        return surface
@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Run without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+from settings import *
+from main import Game
+from mapfile import MAP_EXT, convert
+
+# Scripted input: each entry is held for SCRIPT_HOLD frames, then the next
+SCRIPT = [
+    (pg.K_RIGHT,),
+    (pg.K_DOWN,),
+    (pg.K_LEFT,),
+    (pg.K_UP,),
+    (pg.K_RIGHT, pg.K_DOWN),
+    (pg.K_LEFT, pg.K_UP),
+]
+SCRIPT_HOLD = 30
+
+
+class ScriptedKeys:
+    # Stands in for pg.key.get_pressed() with a fixed set of held keys
+    def __init__(self, pressed):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class BenchGame(Game):
+    def __init__(self, map_file, cache_folder):
+        self.frame = 0
+        self.timings = {"collision": 0}
+        self.cache_folder = cache_folder
+        super().__init__(map_file)
+
+    def load_map(self, map_file, cache_folder):
+        # Keep the generated maps out of the game's own cache
+        super().load_map(map_file, self.cache_folder)
+
+    def get_keys(self):
+        return ScriptedKeys(SCRIPT[self.frame // SCRIPT_HOLD % len(SCRIPT)])
+
+    def new(self):
+        super().new()
+        # Time wall resolution separately, it runs inside update()
+        resolve = self.entities.resolve
+
+        def timed_resolve(axis):
+            start = time.perf_counter()
+            resolve(axis)
+            self.timings["collision"] += time.perf_counter() - start
+
+        self.entities.resolve = timed_resolve
+
+    def load_data(self):
+        start = time.perf_counter()
+        super().load_data()
+        self.timings["load"] = time.perf_counter() - start
+
+
+def generate_map(filename, size, seed=0):
+    # Square map with a solid border, scattered walls and the player in
+    # the middle of a clear area
+    rng = random.Random(seed)
+    middle = size // 2
+    with open(filename, "wt") as f:
+        for row in range(size):
+            tiles = []
+            for col in range(size):
+                if row in (0, size - 1) or col in (0, size - 1):
+                    tiles.append("1")
+                elif (col, row) == (middle, middle):
+                    tiles.append("p")
+                elif abs(col - middle) <= 2 and abs(row - middle) <= 2:
+                    tiles.append(".")
+                else:
+                    tiles.append("1" if rng.random() < 0.15 else ".")
+            f.write("".join(tiles) + "\n")
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+
+    def pick(p):
+        return round(samples[min(int(len(samples) * p), len(samples) - 1)] * 1000, 4)
+
+    mean = sum(samples) / len(samples)
+    return {"p50": pick(0.5), "p90": pick(0.9), "p99": pick(0.99), "max": pick(1), "mean": round(mean * 1000, 4)}
+
+
+def run_frames(game, frames):
+    samples = {"update": [], "collision": [], "draw": []}
+    game.dt = 1 / TICK_RATE
+    game.alpha = 1
+    for game.frame in range(frames):
+        pg.event.pump()
+        game.timings["collision"] = 0
+        start = time.perf_counter()
+        game.update()
+        updated = time.perf_counter()
+        game.draw()
+        drawn = time.perf_counter()
+        samples["update"].append(updated - start)
+        samples["collision"].append(game.timings["collision"])
+        samples["draw"].append(drawn - updated)
+    return samples
+
+
+def bench_map(map_file, frames, cache_folder):
+    start = time.perf_counter()
+    game = BenchGame(map_file, cache_folder)
+    ready = time.perf_counter()
+    game.new()
+    built = time.perf_counter()
+    samples = run_frames(game, frames)
+    restart = time.perf_counter()
+    game.new()
+    restarted = time.perf_counter()
+    result = {
+        "init_ms": round((ready - start - game.timings["load"]) * 1000, 4),
+        "load_ms": round(game.timings["load"] * 1000, 4),
+        "sprites_ms": round((built - ready) * 1000, 4),
+        "restart_ms": round((restarted - restart) * 1000, 4),
+        "sprites": len(game.all_sprites),
+        "walls": len(game.walls),
+    }
+    for phase, times in samples.items():
+        result[phase] = percentiles(times)
+    pg.quit()
+
+    # Loading again hits the map cache written by the first load
+    game = BenchGame(map_file, cache_folder)
+    result["cached_load_ms"] = round(game.timings["load"] * 1000, 4)
+    pg.quit()
+
+    # Separate pass for memory, tracemalloc would skew the timings above
+    tracemalloc.start()
+    game = BenchGame(map_file, cache_folder)
+    game.new()
+    run_frames(game, min(frames, SCRIPT_HOLD))
+    result["peak_python_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+    tracemalloc.stop()
+    pg.quit()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game loop headless on generated maps")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--sizes", default="32,64,128,256", help="comma separated map sizes in tiles")
+    parser.add_argument("--chunked", action="store_true", help=f"also bench the maps converted to {MAP_EXT}")
+    parser.add_argument("--out", default="bench.json")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "pygame": pg.version.ver,
+        "frames": args.frames,
+        "settings": {"FIXED_TIMESTEP": FIXED_TIMESTEP, "TICK_RATE": TICK_RATE, "BAKE_STATIC_TILES": BAKE_STATIC_TILES},
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as folder:
+        for size in (int(size) for size in args.sizes.split(",")):
+            map_file = os.path.join(folder, f"bench{size}.txt")
+            generate_map(map_file, size)
+            kinds = [("text", map_file)]
+            if args.chunked:
+                chunked = os.path.join(folder, f"bench{size}{MAP_EXT}")
+                convert(map_file, chunked)
+                kinds.append(("chunked", chunked))
+            for kind, filename in kinds:
+                result = {"size": size, "map": kind}
+                result.update(bench_map(filename, args.frames, os.path.join(folder, "cache")))
+                report["results"].append(result)
+                print(
+                    f"{kind:8} {size:5}x{size:<5} load {result['load_ms']:8.2f} ms"
+                    f"  cached {result['cached_load_ms']:8.2f} ms"
+                    f"  sprites {result['sprites_ms']:8.2f} ms"
+                    f"  update p50 {result['update']['p50']:6.3f} ms"
+                    f"  collision p50 {result['collision']['p50']:6.3f} ms"
+                    f"  draw p50 {result['draw']['p50']:6.3f} ms"
+                    f"  peak {result['peak_python_kb']} KB"
+                )
+    report["maxrss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open(args.out, "wt") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import numpy as np
+from settings import *
+from mapfile import ChunkedMap
+
+
+def solid_lookup(grid):
+    # Vectorised is_solid for in-bounds (cols, rows) arrays
+    if isinstance(grid, ChunkedMap):
+        return chunked_lookup(grid)
+    cells = np.frombuffer(grid.cells, np.uint8).reshape(grid.tileheight, grid.tilewidth)
+    return lambda cols, rows: cells[rows, cols] == 1
+
+
+def chunked_lookup(grid):
+    # Reads the chunks the map has loaded, and copies any other chunk out of
+    # the file, so no view into the mmap outlives the call and close() works
+    size = grid.chunksize
+    solid = np.zeros(256, bool)
+    solid[list(grid.solid)] = True
+
+    def lookup(cols, rows):
+        keys = (rows // size) * grid.chunkswide + cols // size
+        index = (rows % size) * size + cols % size
+        result = np.empty(cols.shape, bool)
+        for key in np.unique(keys).tolist():
+            cy, cx = divmod(key, grid.chunkswide)
+            chunk = grid.chunks.get((cx, cy))
+            if chunk is None:
+                chunk = grid.read_chunk(cx, cy)
+            mask = keys == key
+            result[mask] = solid[np.frombuffer(chunk, np.uint8)[index[mask]]]
+        return result
+
+    return lookup
+
+
+def pixel(values):
+    # Float to int the way pg.Rect does it, rounding halves away from zero
+    return np.copysign(np.floor(np.abs(values) + 0.5), values).astype(np.int64)
+
+
+class EntityStore:
+    # Position, velocity and rect of every moving entity in contiguous
+    # arrays, so movement and wall collision run once per tick for all of
+    # them. Entities must fit in a tile, so a rect overlaps at most 2x2 tiles.
+    def __init__(self, grid, capacity=64):
+        self.grid = grid
+        self.solid_at = solid_lookup(grid)
+        self.count = 0
+        self.owners = []
+        self.pos = np.zeros((capacity, 2))
+        self.prev = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.rect = np.zeros((capacity, 2), np.int64)
+        self.size = np.zeros((capacity, 2), np.int64)
+
+    def add(self, owner, x, y, width, height):
+        if width > TILESIZE or height > TILESIZE:
+            raise ValueError(f"entities can be at most {TILESIZE}x{TILESIZE}")
+        if self.count == len(self.pos):
+            for name in ("pos", "prev", "vel", "rect", "size"):
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate([array, np.zeros_like(array)]))
+        i = self.count
+        self.pos[i] = self.prev[i] = x, y
+        self.vel[i] = 0, 0
+        self.rect[i] = pixel(self.pos[i])
+        self.size[i] = width, height
+        self.owners.append(owner)
+        self.count += 1
+        return i
+
+    def remove(self, owner):
+        # Move the last entity into the freed slot to keep the arrays packed
+        i, last = owner.index, self.count - 1
+        for array in (self.pos, self.prev, self.vel, self.rect, self.size):
+            array[i] = array[last]
+        self.owners[i] = self.owners[last]
+        self.owners[i].index = i
+        self.owners.pop()
+        self.count -= 1
+
+    def solid(self, cols, rows):
+        inside = (cols >= 0) & (cols < self.grid.tilewidth) & (rows >= 0) & (rows < self.grid.tileheight)
+        cols = np.clip(cols, 0, self.grid.tilewidth - 1)
+        rows = np.clip(rows, 0, self.grid.tileheight - 1)
+        return inside & self.solid_at(cols, rows)
+
+    def resolve(self, axis):
+        # Push entities out of the first wall they overlap on axis, in the
+        # same map order TileGrid.collide reports hits
+        n = self.count
+        rect, size, pos, vel = self.rect[:n], self.size[:n], self.pos[:n], self.vel[:n]
+        left, top = rect[:, 0], rect[:, 1]
+        c0, c1 = left // TILESIZE, (left + size[:, 0] - 1) // TILESIZE
+        r0, r1 = top // TILESIZE, (top + size[:, 1] - 1) // TILESIZE
+        # The (up to) four tiles under each rect, in row-major order
+        hits = self.solid(np.stack((c0, c1, c0, c1)), np.stack((r0, r0, r1, r1)))
+        hit = hits.any(axis=0)
+        if not hit.any():
+            return
+        # Tile coordinate of the first hit along this axis
+        if axis == 0:
+            first = np.where(hits[0], c0, np.where(hits[1], c1, np.where(hits[2], c0, c1)))
+        else:
+            first = np.where(hits[0] | hits[1], r0, r1)
+        edge = first * TILESIZE
+        moving = vel[:, axis]
+        pos[:, axis] = np.where(hit & (moving > 0), edge - size[:, axis], pos[:, axis])
+        pos[:, axis] = np.where(hit & (moving < 0), edge + TILESIZE, pos[:, axis])
+        moving[hit] = 0
+        rect[:, axis] = np.where(hit, pixel(pos[:, axis]), rect[:, axis])
+
+    def step(self, dt):
+        n = self.count
+        if not n:
+            return
+        self.prev[:n] = self.pos[:n]
+        self.pos[:n] += self.vel[:n] * dt
+        self.rect[:n, 0] = pixel(self.pos[:n, 0])
+        self.resolve(0)
+        self.rect[:n, 1] = pixel(self.pos[:n, 1])
+        self.resolve(1)
+
+    def sync(self):
+        # Copy the resolved rects back onto the sprites for drawing
+        for owner, (x, y) in zip(self.owners, self.rect[:self.count].tolist()):
+            owner.rect.topleft = x, y
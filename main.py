@@ -1,53 +1,153 @@
+import argparse
 import pygame as pg
 import sys
 from os import path
 from settings import *
 from sprites import *
 from tilemap import *
+from assets import Assets
+from perf import Perf
+from navigation import Navigator
+from entities import EntityStore
+from replay import Recorder
+from mapfile import ChunkedMap, MAP_EXT
+import mapcache
 
 
 class Game:
-    def __init__(self):
-        pg.init()
+    def __init__(self, map_file=MAP_FILE, recorder=None):
+        self.map_file = map_file
+        self.recorder = recorder
+        # Only the display, fonts start on first use and audio never does
+        pg.display.init()
         self.screen = pg.display.set_mode((WIDTH, HEIGHT))
         pg.display.set_caption(TITLE)
         self.clock = pg.time.Clock()
+        self.assets = Assets()
+        self.perf = Perf(self.assets)
         self.load_data()
 
     def load_data(self):
+        # Everything built from the map lives as long as the Game, so new()
+        # only has to reset the actors
         game_folder = path.dirname(__file__)
-        self.map = Map(path.join(game_folder, "map2.txt"))
+        map_file = self.map_path = path.join(game_folder, self.map_file)
+        self.streaming = map_file.endswith(MAP_EXT)
+        self.static_layer = None
+        if self.streaming:
+            self.map = self.grid = ChunkedMap(map_file, STREAM_RADIUS)
+            self.spawn = self.map.spawn
+            self.static_layer = StaticLayer(self.grid, self.assets.tile(GREEN), self.map.chunksize, preload=False)
+        else:
+            self.load_map(map_file, path.join(game_folder, MAP_CACHE_FOLDER))
+        # Wall sprites are only needed to draw walls one by one, collision
+        # reads the grid and the static layer draws them baked
+        self.walls = pg.sprite.Group()
+        if not self.static_layer:
+            for row, tiles in enumerate(self.map.data):
+                for col, tile in enumerate(tiles):
+                    if tile == "1":
+                        Wall(self, col, row)
+        self.nav = Navigator(self.grid)
+
+    def load_map(self, map_file, cache_folder):
+        # The parsed map, solid grid and spawn come from the on-disk cache
+        # when this exact map was loaded before. Chunks are baked as they
+        # come into view, which is quicker than reading them back from disk.
+        cached = mapcache.load(map_file, cache_folder) if MAP_CACHE else None
+        if cached:
+            self.map, self.grid, self.spawn = cached
+        else:
+            self.map = Map(map_file)
+            self.grid = TileGrid(self.map.data)
+            self.spawn = None
+            for row, tiles in enumerate(self.map.data):
+                if "p" in tiles:
+                    self.spawn = tiles.index("p"), row
+                    break
+            if MAP_CACHE:
+                mapcache.save(map_file, self.map, self.grid, self.spawn, cache_folder)
+        if BAKE_STATIC_TILES:
+            self.static_layer = StaticLayer(self.grid, self.assets.tile(GREEN), preload=False)
 
     def new(self):
         # Initialize all variables and setup for a new game
-        self.player = None
-        self.all_sprites = pg.sprite.Group()
-        self.walls = pg.sprite.Group()
-        for row, tiles in enumerate(self.map.data):
-            for col, tile in enumerate(tiles):
-                if tile == "1":
-                    Wall(self, col, row)
-                if tile == "p":
-                    self.player = Player(self, col, row)
+        self.all_sprites = pg.sprite.Group(self.walls)
+        self.actors = pg.sprite.Group()
+        self.entities = EntityStore(self.grid)
+        self.player = Player(self, *self.spawn)
         self.camera = Camera(self.map.width, self.map.height)
+        self.accumulator = 0
+        self.alpha = 1
+        if self.recorder:
+            self.recorder.start(self)
+        self.drawn_offset = None
+        self.drawn_rects = {}
 
     def run(self):
         # Game loop
         self.playing = True
+        perf = self.perf
         while self.playing:
-            self.dt = self.clock.tick(FPS) / 1000
+            frame_time = self.clock.tick(FPS) / 1000
+            if perf.enabled:
+                perf.begin_frame()
             self.events()
-            self.update()
+            if perf.enabled:
+                perf.lap("events")
+            if FIXED_TIMESTEP:
+                self.step(frame_time)
+            else:
+                self.dt = frame_time
+                self.update()
+            if perf.enabled:
+                perf.lap("update")
             self.draw()
+            if perf.enabled:
+                perf.lap("draw")
+                perf.end_frame(len(self.all_sprites))
+
+    def step(self, frame_time):
+        # Run the fixed ticks this frame's time covers, keeping the
+        # remainder for the next frame and for interpolation
+        self.dt = 1 / TICK_RATE
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= self.dt:
+            if steps == MAX_CATCHUP_STEPS:
+                # Too far behind, drop the time rather than spiral
+                self.accumulator %= self.dt
+                break
+            self.update()
+            self.accumulator -= self.dt
+            steps += 1
+        self.alpha = self.accumulator / self.dt
+
+    def get_keys(self):
+        # Keyboard state for this tick, swapped out by bench and replay
+        return pg.key.get_pressed()
 
     def quit(self):
+        if self.recorder:
+            self.recorder.save()
         pg.quit()
         sys.exit()
 
     def update(self):
-        # Update of the game loop
-        self.all_sprites.update()
+        # Update of the game loop. Walls never change, so only actors get a
+        # per-sprite update, then all of them move in one batch.
+        self.keys = self.get_keys()
+        self.actors.update()
+        self.entities.step(self.dt)
+        self.entities.sync()
+        if self.recorder:
+            self.recorder.record(self)
         self.camera.update(self.player)
+        self.nav.track(self.player.rect)
+        if self.streaming:
+            view = pg.Rect(-self.camera.camera.x, -self.camera.camera.y, WIDTH, HEIGHT)
+            loaded, unloaded = self.map.update(view)
+            self.static_layer.drop(unloaded)
 
     def draw_grid(self):
         for x in range(0, WIDTH, TILESIZE):
@@ -55,12 +155,54 @@ class Game:
         for y in range(0, HEIGHT, TILESIZE):
             pg.draw.line(self.screen, LIGHTGREY, (0, y), (WIDTH, y))
 
-    def draw(self):
+    def draw_background(self):
         self.screen.fill(BGCOLOR)
-        self.draw_grid()
-        for sprite in self.all_sprites:
-            self.screen.blit(sprite.image, self.camera.apply(sprite))
+        if self.static_layer:
+            # Walls and grid come pre-rendered, only actors are drawn per sprite
+            self.static_layer.draw(self.screen, self.camera)
+        else:
+            self.draw_grid()
+            for sprite in self.walls:
+                self.screen.blit(sprite.image, self.camera.apply(sprite))
+
+    def draw(self):
+        # Actors are drawn between their last two ticks, the camera follows
+        # the drawn player so scrolling is just as smooth
+        self.camera.follow(self.player.lerp_rect(self.alpha))
+        actors = {sprite: self.camera.apply_rect(sprite.lerp_rect(self.alpha)) for sprite in self.actors}
+        if DIRTY_RECTS and self.camera.camera.topleft == self.drawn_offset and not self.perf.overlay:
+            self.draw_dirty(actors)
+            return
+        self.draw_background()
+        for sprite, rect in actors.items():
+            self.screen.blit(sprite.image, rect)
+        if self.perf.overlay:
+            self.perf.draw(self.screen)
         pg.display.flip()
+        self.drawn_offset = self.camera.camera.topleft
+        self.drawn_rects = actors
+
+    def draw_dirty(self, actors):
+        # The camera did not move, so only the areas actors left or entered
+        # since the last frame are repainted and sent to the display
+        dirty = []
+        for sprite, rect in self.drawn_rects.items():
+            if actors.get(sprite) != rect:
+                dirty.append(rect)
+        for sprite, rect in actors.items():
+            if self.drawn_rects.get(sprite) != rect:
+                dirty.append(rect)
+        if not dirty:
+            return
+        for area in dirty:
+            self.screen.set_clip(area)
+            self.draw_background()
+        self.screen.set_clip(None)
+        for sprite, rect in actors.items():
+            if rect.collidelist(dirty) != -1:
+                self.screen.blit(sprite.image, rect)
+        pg.display.update(dirty)
+        self.drawn_rects = actors
 
     def events(self):
         # catch all events here
@@ -70,6 +212,11 @@ class Game:
             if event.type == pg.KEYDOWN:
                 if event.key == pg.K_ESCAPE:
                     self.quit()
+                if event.key == pg.K_F3:
+                    self.perf.toggle_overlay()
+                    self.drawn_offset = None
+                if event.key == pg.K_F4 and self.perf.enabled:
+                    print(f"Performance trace written to {self.perf.dump()}")
 
     def show_start_screen(self):
         pass
@@ -78,10 +225,15 @@ class Game:
         pass
 
 
-# Create game object
-g = Game()
-g.show_start_screen()
-while True:
-    g.new()
-    g.run()
-    g.show_go_screen()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--record", metavar="FILE", help="record input for python replay.py FILE")
+    args = parser.parse_args()
+
+    # Create game object
+    g = Game(recorder=args.record and Recorder(args.record))
+    g.show_start_screen()
+    while True:
+        g.new()
+        g.run()
+        g.show_go_screen()
@@ -0,0 +1,49 @@
+import hashlib
+import os
+import pickle
+from settings import *
+
+# Bump when the cached structures change shape
+CACHE_VERSION = 1
+
+
+def file_hash(filename, digest=None):
+    # Hex SHA-1 of the file's contents, added to digest if one is given
+    digest = digest or hashlib.sha1()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_file(filename, folder=MAP_CACHE_FOLDER):
+    # Keyed by the map's contents and the settings that change what is
+    # derived from it, so an edited map never hits stale data
+    digest = hashlib.sha1(repr((CACHE_VERSION, TILESIZE)).encode())
+    return os.path.join(folder, file_hash(filename, digest) + ".pickle")
+
+
+def load(filename, folder=MAP_CACHE_FOLDER):
+    # (map, grid, spawn) from the cache, or None on a miss. Anything wrong
+    # with the cache file, down to classes that have since moved or been
+    # renamed, counts as a miss and the map is parsed again.
+    try:
+        with open(cache_file(filename, folder), "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def save(filename, game_map, grid, spawn, folder=MAP_CACHE_FOLDER):
+    # Returns whether the cache was written. A folder that can't be
+    # created or written to just means the map is parsed every time.
+    target = cache_file(filename, folder)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        # Write then rename so a crash never leaves half a cache file behind
+        with open(target + ".tmp", "wb") as f:
+            pickle.dump((game_map, grid, spawn), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(target + ".tmp", target)
+    except (OSError, pickle.PicklingError):
+        return False
+    return True
@@ -0,0 +1,140 @@
+import mmap
+import struct
+import sys
+from settings import *
+from tilemap import TileGrid
+
+# Binary map layout: a fixed header followed by the tiles one chunk after
+# another, each chunk CHUNKSIZE x CHUNKSIZE bytes in row-major order, so a
+# chunk is a single contiguous read. Tiles keep their text map character.
+MAGIC = b"OSMP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIii")  # magic, version, chunksize, width, height, spawn
+MAP_EXT = ".osm"
+EMPTY = b"."
+
+
+def convert(src, dst, chunksize=CHUNKSIZE):
+    # Stream a text map into the chunked format one band of chunk rows at a
+    # time, so the source never has to fit in memory
+    spawn = (-1, -1)
+    tilewidth = None
+    tileheight = 0
+    with open(src, "rt") as f, open(dst, "wb") as out:
+        out.write(bytes(HEADER.size))
+        band = []
+        for line in f:
+            tiles = line.strip().encode("ascii")
+            if tilewidth is None:
+                tilewidth = len(tiles)
+            col = tiles.find(b"p")
+            if col != -1 and spawn[0] == -1:
+                spawn = (col, tileheight)
+            band.append(tiles[:tilewidth].ljust(tilewidth, EMPTY))
+            tileheight += 1
+            if len(band) == chunksize:
+                _write_band(out, band, tilewidth, chunksize)
+                band = []
+        if band:
+            _write_band(out, band, tilewidth, chunksize)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, VERSION, chunksize, tilewidth or 0, tileheight, *spawn))
+
+
+def _write_band(out, band, tilewidth, chunksize):
+    band = band + [EMPTY * tilewidth] * (chunksize - len(band))
+    for x in range(0, tilewidth, chunksize):
+        for tiles in band:
+            out.write(tiles[x:x + chunksize].ljust(chunksize, EMPTY))
+
+
+class ChunkedMap(TileGrid):
+    # Memory-mapped chunked map. Chunks around the camera are copied into
+    # memory by update() and dropped again once the camera moves away.
+    def __init__(self, filename, radius=1, solid=b"1"):
+        self.file = open(filename, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, chunksize, tilewidth, tileheight, col, row = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{filename} is not a version {VERSION} chunked map")
+        self.chunksize = chunksize
+        self.tilewidth = tilewidth
+        self.tileheight = tileheight
+        self.width = tilewidth * TILESIZE
+        self.height = tileheight * TILESIZE
+        self.chunkswide = -(-tilewidth // chunksize)
+        self.chunkshigh = -(-tileheight // chunksize)
+        self.spawn = (col, row) if col >= 0 else None
+        self.radius = radius
+        self.solid = solid
+        self.chunks = {}
+
+    def chunk_offset(self, cx, cy):
+        area = self.chunksize * self.chunksize
+        return HEADER.size + (cy * self.chunkswide + cx) * area
+
+    def read_chunk(self, cx, cy):
+        start = self.chunk_offset(cx, cy)
+        return self.mm[start:start + self.chunksize * self.chunksize]
+
+    def read_rows(self):
+        # The whole map as row-major bytes, reassembled one band of chunk
+        # rows at a time for callers that need every tile at once
+        size = self.chunksize
+        area = size * size
+        rows = []
+        for cy in range(self.chunkshigh):
+            start = self.chunk_offset(0, cy)
+            band = self.mm[start:start + self.chunkswide * area]
+            for y in range(min(size, self.tileheight - cy * size)):
+                row = b"".join(band[base + y * size:base + (y + 1) * size] for base in range(0, len(band), area))
+                rows.append(row[:self.tilewidth])
+        return b"".join(rows)
+
+    def tile(self, col, row):
+        if not (0 <= col < self.tilewidth and 0 <= row < self.tileheight):
+            return None
+        cx, x = divmod(col, self.chunksize)
+        cy, y = divmod(row, self.chunksize)
+        index = y * self.chunksize + x
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            return self.mm[self.chunk_offset(cx, cy) + index]
+        return chunk[index]
+
+    def is_solid(self, col, row):
+        tile = self.tile(col, row)
+        return tile is not None and tile in self.solid
+
+    def chunks_around(self, rect):
+        # Chunk coordinates overlapping rect (in pixels), widened by radius
+        size = self.chunksize * TILESIZE
+        left = max(rect.left // size - self.radius, 0)
+        top = max(rect.top // size - self.radius, 0)
+        right = min((rect.right - 1) // size + self.radius, self.chunkswide - 1)
+        bottom = min((rect.bottom - 1) // size + self.radius, self.chunkshigh - 1)
+        return {(cx, cy) for cy in range(top, bottom + 1) for cx in range(left, right + 1)}
+
+    def update(self, rect):
+        # Keep only the chunks around rect resident, return what changed
+        wanted = self.chunks_around(rect)
+        loaded = wanted - self.chunks.keys()
+        unloaded = self.chunks.keys() - wanted
+        for key in unloaded:
+            del self.chunks[key]
+        for key in loaded:
+            self.chunks[key] = self.read_chunk(*key)
+        return loaded, unloaded
+
+    def close(self):
+        self.chunks = {}
+        self.mm.close()
+        self.file.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: python {sys.argv[0]} map.txt map{MAP_EXT}")
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
@@ -0,0 +1,174 @@
+import heapq
+from array import array
+from collections import OrderedDict, deque
+from settings import *
+from mapfile import ChunkedMap
+
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+# Distance of tiles the search has not reached, caps NAV_RADIUS
+UNREACHED = 0xFFFF
+
+
+class NavGrid:
+    # One byte per tile, 1 where an actor can stand, built from a TileGrid
+    # or ChunkedMap for searches that touch many tiles
+    def __init__(self, grid):
+        self.width = grid.tilewidth
+        self.height = grid.tileheight
+        if isinstance(grid, ChunkedMap):
+            table = bytes(0 if tile in grid.solid else 1 for tile in range(256))
+            self.walkable = grid.read_rows().translate(table)
+        else:
+            self.walkable = grid.cells.translate(bytes([1, 0]) + bytes(254))
+
+    def is_walkable(self, col, row):
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return self.walkable[row * self.width + col] == 1
+        return False
+
+    def neighbours(self, col, row):
+        for dx, dy in NEIGHBOURS:
+            if self.is_walkable(col + dx, row + dy):
+                yield col + dx, row + dy
+
+    def astar(self, start, goal):
+        # Shortest tile path from start to goal, both included, or None
+        if not (self.is_walkable(*start) and self.is_walkable(*goal)):
+            return None
+        frontier = [(0, 0, start)]
+        came_from = {start: None}
+        cost = {start: 0}
+        while frontier:
+            _, steps, current = heapq.heappop(frontier)
+            if current == goal:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                return path[::-1]
+            if steps > cost[current]:
+                continue
+            for tile in self.neighbours(*current):
+                new_cost = steps + 1
+                if new_cost < cost.get(tile, new_cost + 1):
+                    cost[tile] = new_cost
+                    came_from[tile] = current
+                    estimate = new_cost + abs(goal[0] - tile[0]) + abs(goal[1] - tile[1])
+                    heapq.heappush(frontier, (estimate, new_cost, tile))
+        return None
+
+
+class FlowField:
+    # Steps to the target from tiles within `radius` of it, in a flat array
+    # over the square around the target. The breadth-first search only runs
+    # as far as the furthest actor that asked for a direction and resumes
+    # from its queue when one asks from further away, so a new target costs
+    # as much as the actors near it need rather than the whole radius.
+    def __init__(self, nav, target, radius=NAV_RADIUS):
+        self.nav = nav
+        self.target = target
+        self.radius = radius
+        self.side = 2 * radius + 1
+        self.distance = array("H", [UNREACHED]) * (self.side * self.side)
+        self.queue = deque()
+        if nav.is_walkable(*target):
+            self.distance[self.index(*target)] = 0
+            self.queue.append(target)
+
+    def index(self, col, row):
+        x = col - self.target[0] + self.radius
+        y = row - self.target[1] + self.radius
+        if 0 <= x < self.side and 0 <= y < self.side:
+            return y * self.side + x
+        return None
+
+    def expand(self, until):
+        # Carry on with the search until the tile at index `until` is reached
+        distance, queue, nav, side = self.distance, self.queue, self.nav, self.side
+        left, top = self.target[0] - self.radius, self.target[1] - self.radius
+        while queue and distance[until] == UNREACHED:
+            col, row = queue.popleft()
+            i = (row - top) * side + col - left
+            steps = distance[i] + 1
+            if steps > self.radius:
+                # Everything still queued is at least as far
+                queue.clear()
+                break
+            # Within the radius a neighbour never leaves the square
+            for dx, dy in NEIGHBOURS:
+                j = i + dy * side + dx
+                if distance[j] == UNREACHED and nav.is_walkable(col + dx, row + dy):
+                    distance[j] = steps
+                    queue.append((col + dx, row + dy))
+
+    def steps(self, col, row):
+        # Steps from (col, row) to the target, None if out of reach
+        i = self.index(col, row)
+        if i is None:
+            return None
+        if self.distance[i] == UNREACHED:
+            self.expand(i)
+        steps = self.distance[i]
+        return None if steps == UNREACHED else steps
+
+    def direction(self, col, row):
+        # Unit step (dx, dy) towards the target, (0, 0) at it or out of reach
+        best = self.steps(col, row)
+        step = (0, 0)
+        if best is None:
+            return step
+        # Breadth-first order means every closer neighbour is already known
+        for dx, dy in NEIGHBOURS:
+            i = self.index(col + dx, row + dy)
+            if i is not None and self.distance[i] < best:
+                best, step = self.distance[i], (dx, dy)
+        return step
+
+
+class Navigator:
+    # Shared by every enemy: tracks the player's tile and hands out the flow
+    # field towards it. Fields are built on first use and kept per target
+    # tile in an LRU cache, so walking back and forth costs nothing.
+    def __init__(self, grid, cache_size=NAV_CACHE_SIZE, radius=NAV_RADIUS):
+        self.grid = grid
+        self.cache_size = cache_size
+        self.radius = radius
+        self.nav = None
+        self.fields = OrderedDict()
+        self.target = None
+        self.field = None
+
+    def tile(self, rect):
+        return rect.centerx // TILESIZE, rect.centery // TILESIZE
+
+    def track(self, rect):
+        # Cheap enough to call every tick, nothing is computed here
+        target = self.tile(rect)
+        if target != self.target:
+            self.target = target
+            self.field = None
+
+    def flow_field(self, target):
+        field = self.fields.get(target)
+        if field is not None:
+            self.fields.move_to_end(target)
+            return field
+        if self.nav is None:
+            self.nav = NavGrid(self.grid)
+        field = self.fields[target] = FlowField(self.nav, target, self.radius)
+        if len(self.fields) > self.cache_size:
+            self.fields.popitem(last=False)
+        return field
+
+    def direction(self, rect):
+        # Step towards the tracked target for an actor at rect
+        if self.target is None:
+            return 0, 0
+        if self.field is None:
+            self.field = self.flow_field(self.target)
+        return self.field.direction(*self.tile(rect))
+
+    def path(self, start, goal):
+        if self.nav is None:
+            self.nav = NavGrid(self.grid)
+        return self.nav.astar(start, goal)
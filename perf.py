@@ -0,0 +1,119 @@
+import json
+import time
+from array import array
+import pygame as pg
+from settings import *
+
+PHASES = ("events", "update", "draw")
+
+
+class FrameStats:
+    # Ring buffer of the last `size` frames: start time, frame period,
+    # time spent in each phase and the sprite count
+    def __init__(self, size=PERF_HISTORY):
+        self.size = size
+        self.count = 0
+        self.start = array("d", bytes(8 * size))
+        self.frame = array("d", bytes(8 * size))
+        self.phases = {name: array("d", bytes(8 * size)) for name in PHASES}
+        self.sprites = array("l", bytes(array("l").itemsize * size))
+
+    def record(self, start, frame, phases, sprites):
+        i = self.count % self.size
+        self.start[i] = start
+        self.frame[i] = frame
+        for name in PHASES:
+            self.phases[name][i] = phases.get(name, 0)
+        self.sprites[i] = sprites
+        self.count += 1
+
+    def indices(self):
+        # Buffer positions from oldest to newest
+        first = max(self.count - self.size, 0)
+        return [i % self.size for i in range(first, self.count)]
+
+    def recent(self, values):
+        return [values[i] for i in self.indices()]
+
+    def mean(self, values):
+        n = min(self.count, self.size)
+        return sum(values[:n]) / n if n else 0
+
+    def fps(self):
+        frame = self.mean(self.frame)
+        return 1 / frame if frame else 0
+
+
+class Perf:
+    # Per-frame phase timing for Game.run. While disabled the loop only
+    # checks self.enabled, so leaving it compiled in costs nothing.
+    def __init__(self, assets, enabled=PERF_ENABLED):
+        self.assets = assets
+        self.enabled = enabled
+        self.overlay = False
+        self.stats = FrameStats()
+        self.started = None
+        self.mark = 0
+        self.period = 0
+        self.current = {}
+        self.lines = []
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        self.enabled = self.enabled or self.overlay
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        self.period = now - self.started if self.started is not None else 0
+        self.started = self.mark = now
+        self.current = {}
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.current[name] = self.current.get(name, 0) + now - self.mark
+        self.mark = now
+
+    def end_frame(self, sprites):
+        self.stats.record(self.started, self.period, self.current, sprites)
+
+    def draw(self, surface):
+        stats = self.stats
+        # Text only changes a few times a second, rendering it every frame
+        # would cost more than everything it measures
+        if stats.count % PERF_OVERLAY_REFRESH == 0 or not self.lines:
+            text = [f"FPS {stats.fps():5.1f}  sprites {stats.sprites[(stats.count - 1) % stats.size]}"]
+            for name in PHASES:
+                text.append(f"{name:7} {stats.mean(stats.phases[name]) * 1000:6.2f} ms")
+            font = self.assets.font(PERF_FONT, PERF_FONT_SIZE)
+            self.lines = [font.render(line, False, WHITE) for line in text]
+        height = PERF_FONT_SIZE * len(self.lines) + PERF_GRAPH_HEIGHT + 12
+        panel = pg.Rect(4, 4, stats.size + 8, height)
+        surface.fill(BLACK, panel)
+        y = panel.y + 4
+        for line in self.lines:
+            surface.blit(line, (panel.x + 4, y))
+            y += PERF_FONT_SIZE
+        # Frame time graph, the yellow line marks the FPS budget
+        bottom = panel.bottom - 4
+        scale = PERF_GRAPH_HEIGHT / (2000 / FPS if FPS else 33.3)
+        budget = bottom - (1000 / FPS if FPS else 16.7) * scale
+        pg.draw.line(surface, YELLOW, (panel.x + 4, budget), (panel.right - 4, budget))
+        for x, frame in enumerate(stats.recent(stats.frame)):
+            top = max(bottom - frame * 1000 * scale, bottom - PERF_GRAPH_HEIGHT)
+            color = GREEN if top >= budget else RED
+            pg.draw.line(surface, color, (panel.x + 4 + x, bottom), (panel.x + 4 + x, top))
+
+    def dump(self, filename=PERF_TRACE_FILE):
+        # Chrome trace event format, opens in chrome://tracing or Perfetto
+        stats = self.stats
+        events = []
+        for i in stats.indices():
+            ts = stats.start[i] * 1e6
+            for name in PHASES:
+                dur = stats.phases[name][i] * 1e6
+                events.append({"name": name, "ph": "X", "ts": ts, "dur": dur, "pid": 0, "tid": 0})
+                ts += dur
+            events.append({"name": "sprites", "ph": "C", "ts": stats.start[i] * 1e6, "pid": 0, "args": {"count": stats.sprites[i]}})
+        with open(filename, "wt") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return filename
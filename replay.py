@@ -0,0 +1,154 @@
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import zlib
+import pygame as pg
+from settings import *
+import mapcache
+
+VERSION = 2
+FIELDS = ("map_file", "map_hash", "tick_rate", "inputs", "checksums")
+# Input bit for every key the player reads
+KEY_BITS = {
+    pg.K_LEFT: 1, pg.K_a: 1,
+    pg.K_RIGHT: 2, pg.K_d: 2,
+    pg.K_UP: 4, pg.K_w: 4,
+    pg.K_DOWN: 8, pg.K_s: 8,
+}
+
+
+def encode_keys(keys):
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+class ReplayKeys:
+    # Stands in for pg.key.get_pressed() with the keys of one recorded tick
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+
+def checksum(game):
+    # CRC of everything that moves, enough to spot a diverging replay
+    n = game.entities.count
+    state = game.entities.pos[:n].tobytes() + game.entities.vel[:n].tobytes()
+    return zlib.crc32(state)
+
+
+class Recorder:
+    # Logs the input of every simulation tick plus a state checksum every
+    # REPLAY_CHECK_INTERVAL ticks, from the first tick after Game.new
+    def __init__(self, filename):
+        if not FIXED_TIMESTEP:
+            raise ValueError("recording needs FIXED_TIMESTEP, variable ticks can't be replayed")
+        self.filename = filename
+        self.map_file = None
+        self.map_hash = None
+        self.inputs = bytearray()
+        self.checksums = {}
+
+    def start(self, game):
+        self.map_file = game.map_file
+        self.map_hash = mapcache.file_hash(game.map_path)
+        self.inputs = bytearray()
+        self.checksums = {}
+
+    def record(self, game):
+        self.inputs.append(encode_keys(game.keys))
+        tick = len(self.inputs)
+        if tick % REPLAY_CHECK_INTERVAL == 0:
+            self.checksums[tick] = checksum(game)
+
+    def save(self):
+        recording = {
+            "version": VERSION,
+            "map_file": self.map_file,
+            "map_hash": self.map_hash,
+            "tick_rate": TICK_RATE,
+            "inputs": base64.b64encode(self.inputs).decode("ascii"),
+            "checksums": self.checksums,
+        }
+        with open(self.filename, "wt") as f:
+            json.dump(recording, f)
+
+
+def load(filename):
+    with open(filename, "rt") as f:
+        recording = json.load(f)
+    if recording.get("version") != VERSION:
+        raise ValueError(f"{filename} is not a version {VERSION} recording")
+    missing = [field for field in FIELDS if field not in recording]
+    if missing:
+        raise ValueError(f"{filename} has no {', '.join(missing)}")
+    recording["inputs"] = base64.b64decode(recording["inputs"])
+    recording["checksums"] = {int(tick): crc for tick, crc in recording["checksums"].items()}
+    return recording
+
+
+def replay(recording, game=None):
+    # Feed the recorded input through Game.update as fast as possible, with
+    # no frame cap and no drawing. Returns the first tick whose checksum
+    # differs (None if all match) and the time taken by every tick. Raises
+    # ValueError if the map is not the one that was recorded on.
+    from main import Game  # main imports Recorder from here
+
+    if game is None:
+        game = Game(recording["map_file"])
+    if mapcache.file_hash(game.map_path) != recording["map_hash"]:
+        raise ValueError(f"{recording['map_file']} has changed since it was recorded")
+    inputs = recording["inputs"]
+    tick = 0
+    game.get_keys = lambda: ReplayKeys(inputs[tick])
+    game.new()
+    game.dt = 1 / recording["tick_rate"]
+    mismatch = None
+    times = []
+    for tick in range(len(inputs)):
+        start = time.perf_counter()
+        game.update()
+        times.append(time.perf_counter() - start)
+        expected = recording["checksums"].get(tick + 1)
+        if expected is not None and expected != checksum(game) and mismatch is None:
+            mismatch = tick + 1
+    return mismatch, times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session headless and verify it")
+    parser.add_argument("recording", help="file written by python main.py --record")
+    args = parser.parse_args()
+
+    # Replays never open a window or sound card
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    try:
+        recording = load(args.recording)
+        start = time.perf_counter()
+        mismatch, times = replay(recording)
+    except (OSError, KeyError, ValueError) as error:
+        print(f"Can't replay {args.recording}: {error}")
+        return 2
+    elapsed = time.perf_counter() - start
+    ticks = len(times)
+    slowest = max(range(ticks), key=times.__getitem__) if ticks else 0
+    print(f"{ticks} ticks ({ticks / recording['tick_rate']:.1f} s of play) in {elapsed:.2f} s, {ticks / elapsed:.0f} ticks/s")
+    if ticks:
+        print(f"Slowest tick {slowest + 1}: {times[slowest] * 1000:.3f} ms")
+    if mismatch is not None:
+        print(f"State diverged from the recording at tick {mismatch}")
+        return 1
+    print(f"All {len(recording['checksums'])} checksums match")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
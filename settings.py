@@ -10,7 +10,7 @@ YELLOW = (255, 255, 0)
 # Game settings
 WIDTH = 1024
 HEIGHT = 768
-FPS = 60
+FPS = 60  # render cap, 0 renders uncapped
 TITLE = "Only Son"
 BGCOLOR = DARKGREY
 
@@ -18,5 +18,43 @@ TILESIZE = 32
 GRIDWIDTH = WIDTH / TILESIZE
 GRIDHEIGHT = HEIGHT / TILESIZE
 
+# Simulation settings
+FIXED_TIMESTEP = True  # update at TICK_RATE and interpolate when drawing
+TICK_RATE = 60  # simulation ticks per second
+MAX_CATCHUP_STEPS = 5  # ticks run per frame at most, the rest is dropped
+REPLAY_CHECK_INTERVAL = 60  # ticks between state checksums in recordings
+
+# Map settings
+MAP_FILE = "map2.txt"  # text map, or a chunked map converted with mapfile.py
+STREAM_RADIUS = 1  # chunks kept loaded around the camera for chunked maps
+MAP_CACHE = True  # keep parsed text maps and their tile grids on disk
+MAP_CACHE_FOLDER = ".cache"
+
+# Render settings
+BAKE_STATIC_TILES = True  # draw walls and grid from pre-rendered chunks
+CHUNKSIZE = 16  # tiles per side of a baked chunk
+DIRTY_RECTS = False  # repaint only what moved while the camera is still
+ASSET_CACHE_SIZE = 64  # scaled images and rendered text kept by Assets
+
 # Player settings
 PLAYER_SPEED = 300
+
+# Enemy navigation settings
+NAV_RADIUS = 32  # tiles from the player covered by a flow field
+NAV_CACHE_SIZE = 16  # flow fields kept for recently visited player tiles
+
+# Paper (text console) settings
+PAPER_FONT = "font3.ttf"
+PAPER_FONT_SIZE = 24
+PAPER_MARGIN = 16
+PAPER_BGCOLOR = BLACK
+PAPER_TEXT_COLOR = WHITE
+
+# Performance settings (F3 toggles the overlay, F4 dumps a trace)
+PERF_ENABLED = False  # time every frame from startup, not just with the overlay
+PERF_HISTORY = 240  # frames kept for the overlay graph and trace dumps
+PERF_OVERLAY_REFRESH = 15  # frames between overlay text updates
+PERF_FONT = "font1.ttf"
+PERF_FONT_SIZE = 14
+PERF_GRAPH_HEIGHT = 60
+PERF_TRACE_FILE = "perf_trace.json"
@@ -2,75 +2,73 @@ import pygame as pg
 from settings import *
 
 
+def stored(name, axis):
+    # Attribute kept in one column of the game's EntityStore arrays
+    def get(self):
+        return float(getattr(self.game.entities, name)[self.index, axis])
+
+    def set(self, value):
+        getattr(self.game.entities, name)[self.index, axis] = value
+
+    return property(get, set)
+
+
 class Player(pg.sprite.Sprite):
+    # Movement and wall collision run for all entities at once in
+    # EntityStore.step, the player only turns input into velocity
+    x, y = stored("pos", 0), stored("pos", 1)
+    prev_x, prev_y = stored("prev", 0), stored("prev", 1)
+    vx, vy = stored("vel", 0), stored("vel", 1)
+
     def __init__(self, game, x, y):
-        self.groups = game.all_sprites
+        self.groups = game.all_sprites, game.actors
         pg.sprite.Sprite.__init__(self, self.groups)
         self.game = game
-        self.image = pg.Surface((TILESIZE, TILESIZE))
-        self.image.fill(YELLOW)
-        self.rect = self.image.get_rect()
-        self.vx, self.vy = 0, 0
-        self.x = x * TILESIZE
-        self.y = y * TILESIZE
+        self.image = game.assets.tile(YELLOW)
+        self.rect = self.image.get_rect(topleft=(x * TILESIZE, y * TILESIZE))
+        self.index = game.entities.add(self, self.rect.x, self.rect.y, *self.rect.size)
 
     def get_keys(self):
-        self.vx, self.vy = 0, 0
-        keys = pg.key.get_pressed()
+        vx, vy = 0, 0
+        keys = self.game.keys
         if keys[pg.K_LEFT] or keys[pg.K_a]:
-            self.vx = -PLAYER_SPEED
+            vx = -PLAYER_SPEED
         if keys[pg.K_RIGHT] or keys[pg.K_d]:
-            self.vx = PLAYER_SPEED
+            vx = PLAYER_SPEED
         if keys[pg.K_UP] or keys[pg.K_w]:
-            self.vy = -PLAYER_SPEED
+            vy = -PLAYER_SPEED
         if keys[pg.K_DOWN] or keys[pg.K_s]:
-            self.vy = PLAYER_SPEED
-        if self.vx != 0 and self.vy != 0:
-            self.vx *= 0.7071
-            self.vy *= 0.7071
+            vy = PLAYER_SPEED
+        if vx != 0 and vy != 0:
+            vx *= 0.7071
+            vy *= 0.7071
+        self.vx, self.vy = vx, vy
 
     def move(self, dx=0, dy=0):
         self.x += dx
         self.y += dy
 
-    def collide_with_walls(self, dir):
-        if dir == "x":
-            hits = pg.sprite.spritecollide(self, self.game.walls, False)
-            if hits:
-                if self.vx > 0:
-                    self.x = hits[0].rect.left - self.rect.width
-                if self.vx < 0:
-                    self.x = hits[0].rect.right
-                self.vx = 0
-                self.rect.x = self.x
-        if dir == "y":
-            hits = pg.sprite.spritecollide(self, self.game.walls, False)
-            if hits:
-                if self.vy > 0:
-                    self.y = hits[0].rect.top - self.rect.height
-                if self.vy < 0:
-                    self.y = hits[0].rect.bottom
-
-                self.vy = 0
-                self.rect.y = self.y
+    def lerp_rect(self, alpha):
+        # Where to draw between the previous tick (0) and the current one (1)
+        rect = self.rect.copy()
+        rect.x = self.prev_x + (self.x - self.prev_x) * alpha
+        rect.y = self.prev_y + (self.y - self.prev_y) * alpha
+        return rect
 
     def update(self):
         self.get_keys()
-        self.x += self.vx * self.game.dt
-        self.y += self.vy * self.game.dt
-        self.rect.x = self.x
-        self.collide_with_walls("x")
-        self.rect.y = self.y
-        self.collide_with_walls("y")
+
+    def kill(self):
+        self.game.entities.remove(self)
+        pg.sprite.Sprite.kill(self)
 
 
 class Wall(pg.sprite.Sprite):
     def __init__(self, game, x, y):
-        self.groups = game.all_sprites, game.walls
+        self.groups = game.walls
         pg.sprite.Sprite.__init__(self, self.groups)
         self.game = game
-        self.image = pg.Surface((TILESIZE, TILESIZE))
-        self.image.fill(GREEN)
+        self.image = game.assets.tile(GREEN)
         self.rect = self.image.get_rect()
         self.x = x
         self.y = y
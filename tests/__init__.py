@@ -0,0 +1,5 @@
+import os
+
+# Tests never open a real window or sound device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
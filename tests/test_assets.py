@@ -0,0 +1,40 @@
+import unittest
+from assets import Assets
+from settings import TILESIZE, GREEN, YELLOW
+
+
+class TestAssetsMethods(unittest.TestCase):
+    def setUp(self):
+        self.assets = Assets(max_variants=2)
+
+    def test_tile_shared(self):
+        tile = self.assets.tile(GREEN)
+        self.assertIs(self.assets.tile(GREEN), tile)
+        self.assertIsNot(self.assets.tile(YELLOW), tile)
+        self.assertEqual(tile.get_size(), (TILESIZE, TILESIZE))
+
+    def test_image_loaded_once(self):
+        image = self.assets.image("player.png")
+        self.assertIs(self.assets.image("player.png"), image)
+        scaled = self.assets.image("player.png", (TILESIZE, TILESIZE))
+        self.assertEqual(scaled.get_size(), (TILESIZE, TILESIZE))
+        self.assertIs(self.assets.image("player.png", (TILESIZE, TILESIZE)), scaled)
+
+    def test_font_and_text(self):
+        font = self.assets.font("font1.ttf", 20)
+        self.assertIs(self.assets.font("font1.ttf", 20), font)
+        text = self.assets.text("font1.ttf", 20, "Only Son", (255, 255, 255))
+        self.assertIs(self.assets.text("font1.ttf", 20, "Only Son", (255, 255, 255)), text)
+
+    def test_variants_evicted_lru(self):
+        first = self.assets.image("player.png", (8, 8))
+        self.assets.image("player.png", (16, 16))
+        # Touch the first variant so the second one is the oldest
+        self.assertIs(self.assets.image("player.png", (8, 8)), first)
+        self.assets.image("player.png", (24, 24))
+        keys = [key[3] for key in self.assets.variants]
+        self.assertEqual(keys, [(8, 8), (24, 24)])
+
+
+if __name__ == "__main__":
+    unittest.main()
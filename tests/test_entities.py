@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+import pygame as pg
+from settings import TILESIZE
+from tilemap import TileGrid
+from mapfile import ChunkedMap, convert
+from entities import EntityStore
+
+MAP = [
+    "11111",
+    "1...1",
+    "1...1",
+    "11111",
+]
+
+
+class Owner:
+    def __init__(self):
+        self.rect = pg.Rect(0, 0, TILESIZE, TILESIZE)
+
+
+class TestEntityStoreMethods(unittest.TestCase):
+    def setUp(self):
+        self.store = EntityStore(TileGrid(MAP), capacity=2)
+        self.owners = [Owner() for _ in range(3)]
+        for col, owner in enumerate(self.owners, 1):
+            owner.index = self.store.add(owner, col * TILESIZE, TILESIZE, TILESIZE, TILESIZE)
+
+    def test_arrays_grow(self):
+        self.assertEqual(self.store.count, 3)
+        self.assertGreaterEqual(len(self.store.pos), 3)
+        self.assertEqual(self.store.pos[2].tolist(), [3 * TILESIZE, TILESIZE])
+
+    def test_step_moves_all(self):
+        self.store.vel[:3] = 0, 60
+        self.store.step(0.1)
+        self.store.sync()
+        self.assertEqual([owner.rect.topleft for owner in self.owners],
+                         [(col * TILESIZE, TILESIZE + 6) for col in (1, 2, 3)])
+        self.assertEqual(self.store.prev[0].tolist(), [TILESIZE, TILESIZE])
+
+    def test_walls_stop_entities(self):
+        # Left into the wall, down into the floor row
+        self.store.vel[0] = -300, 0
+        self.store.vel[2] = 0, 600
+        self.store.step(0.1)
+        self.store.sync()
+        self.assertEqual(self.owners[0].rect.topleft, (TILESIZE, TILESIZE))
+        self.assertEqual(self.owners[2].rect.topleft, (3 * TILESIZE, 2 * TILESIZE))
+        self.assertEqual(self.store.vel[0].tolist(), [0, 0])
+        self.assertEqual(self.store.vel[2].tolist(), [0, 0])
+
+    def test_remove_keeps_arrays_packed(self):
+        self.store.remove(self.owners[0])
+        self.assertEqual(self.store.count, 2)
+        self.assertEqual(self.owners[2].index, 0)
+        self.assertEqual(self.store.pos[0].tolist(), [3 * TILESIZE, TILESIZE])
+
+    def test_rejects_entities_bigger_than_a_tile(self):
+        with self.assertRaises(ValueError):
+            self.store.add(Owner(), 0, 0, TILESIZE + 1, TILESIZE)
+
+
+class TestEntityStoreChunkedMap(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        src = os.path.join(self.folder.name, "map.txt")
+        with open(src, "wt") as f:
+            f.write("\n".join(["1" * 10] + ["1" + "." * 8 + "1"] * 8 + ["1" * 10]) + "\n")
+        dst = os.path.join(self.folder.name, "map.osm")
+        convert(src, dst, chunksize=4)
+        self.map = ChunkedMap(dst, radius=0)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_walls_from_resident_and_mapped_chunks(self):
+        store = EntityStore(self.map)
+        owners = [Owner(), Owner()]
+        owners[0].index = store.add(owners[0], TILESIZE, TILESIZE, TILESIZE, TILESIZE)
+        owners[1].index = store.add(owners[1], 8 * TILESIZE, 8 * TILESIZE, TILESIZE, TILESIZE)
+        # Only the first entity's chunk is resident
+        self.map.update(pg.Rect(0, 0, TILESIZE, TILESIZE))
+        store.vel[0] = -300, -300
+        store.vel[1] = 300, 300
+        store.step(0.1)
+        store.sync()
+        self.assertEqual(owners[0].rect.topleft, (TILESIZE, TILESIZE))
+        self.assertEqual(owners[1].rect.topleft, (8 * TILESIZE, 8 * TILESIZE))
+
+    def test_map_closes_with_store_alive(self):
+        store = EntityStore(self.map)
+        owner = Owner()
+        owner.index = store.add(owner, TILESIZE, TILESIZE, TILESIZE, TILESIZE)
+        store.step(0.1)
+        self.map.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
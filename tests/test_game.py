@@ -0,0 +1,96 @@
+import unittest
+from unittest import mock
+import pygame as pg
+from settings import MAX_CATCHUP_STEPS, TICK_RATE
+from main import Game
+
+
+class HeldKeys:
+    def __init__(self, *pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class TestGameMethods(unittest.TestCase):
+    def setUp(self):
+        # Parse the map every time instead of caching it in the repo
+        patcher = mock.patch("main.MAP_CACHE", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.game = Game("map.txt")
+        self.game.new()
+        self.keys = HeldKeys()
+        self.game.get_keys = lambda: self.keys
+        self.ticks = 0
+        update = self.game.update
+
+        def counted_update():
+            self.ticks += 1
+            update()
+
+        self.game.update = counted_update
+
+    def tearDown(self):
+        pg.quit()
+
+    def test_step_runs_fixed_ticks(self):
+        self.game.step(2.5 / TICK_RATE)
+        self.assertEqual(self.ticks, 2)
+        self.assertAlmostEqual(self.game.alpha, 0.5)
+        self.assertEqual(self.game.dt, 1 / TICK_RATE)
+
+    def test_step_caps_catch_up(self):
+        self.game.step(1)
+        self.assertEqual(self.ticks, MAX_CATCHUP_STEPS)
+        self.assertLess(self.game.accumulator, self.game.dt)
+
+    def test_player_stops_at_wall(self):
+        self.keys = HeldKeys(pg.K_LEFT)
+        for _ in range(TICK_RATE * 10):
+            self.game.step(1 / TICK_RATE)
+        player = self.game.player
+        self.assertFalse(self.game.grid.collide(player.rect))
+        self.assertTrue(self.game.grid.collide(player.rect.move(-1, 0)))
+
+    def test_only_display_initialised(self):
+        self.assertTrue(pg.display.get_init())
+        self.assertIsNone(pg.mixer.get_init())
+        self.assertFalse(pg.joystick.get_init())
+
+    def test_new_reuses_world(self):
+        grid, layer, nav = self.game.grid, self.game.static_layer, self.game.nav
+        self.game.step(10 / TICK_RATE)
+        self.game.new()
+        self.assertIs(self.game.grid, grid)
+        self.assertIs(self.game.static_layer, layer)
+        self.assertIs(self.game.nav, nav)
+        self.assertEqual(self.game.entities.count, 1)
+        self.assertEqual(self.game.player.rect.topleft, (self.game.spawn[0] * 32, self.game.spawn[1] * 32))
+
+    def test_draw(self):
+        self.game.step(1.5 / TICK_RATE)
+        self.game.draw()
+
+    def test_dirty_rects_skip_still_frames(self):
+        with mock.patch("main.DIRTY_RECTS", True), \
+                mock.patch("pygame.display.flip") as flip, \
+                mock.patch("pygame.display.update") as update:
+            self.game.draw()
+            self.game.draw()
+            self.assertEqual(flip.call_count, 1)
+            update.assert_not_called()
+            # A move that keeps the camera still only repaints the player
+            self.game.camera.follow = lambda rect: None
+            self.game.player.x += 3
+            self.game.player.rect.x = self.game.player.x
+            self.game.draw()
+            self.assertEqual(flip.call_count, 1)
+            dirty = update.call_args[0][0]
+            self.assertEqual(len(dirty), 2)
+            self.assertTrue(all(rect.width == self.game.player.rect.width for rect in dirty))
+
+
+if __name__ == "__main__":
+    unittest.main()
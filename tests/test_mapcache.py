@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+import mapcache
+from tilemap import Map, TileGrid
+
+
+class TestMapCacheMethods(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.folder.name, "cache")
+        self.filename = os.path.join(self.folder.name, "map.txt")
+        self.write_map(["1111", "1p.1", "1111"])
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write_map(self, rows):
+        with open(self.filename, "wt") as f:
+            f.write("\n".join(rows) + "\n")
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(mapcache.load(self.filename, self.cache))
+        game_map = Map(self.filename)
+        grid = TileGrid(game_map.data)
+        mapcache.save(self.filename, game_map, grid, (1, 1), self.cache)
+        cached_map, cached_grid, spawn = mapcache.load(self.filename, self.cache)
+        self.assertEqual(cached_map.data, game_map.data)
+        self.assertEqual(cached_grid.cells, grid.cells)
+        self.assertEqual(spawn, (1, 1))
+
+    def test_edited_map_misses(self):
+        game_map = Map(self.filename)
+        mapcache.save(self.filename, game_map, TileGrid(game_map.data), (1, 1), self.cache)
+        self.write_map(["1111", "1.p1", "1111"])
+        self.assertIsNone(mapcache.load(self.filename, self.cache))
+
+    def test_stale_cache_misses(self):
+        os.makedirs(self.cache)
+        # Pickle of a class that no longer exists
+        with open(mapcache.cache_file(self.filename, self.cache), "wb") as f:
+            f.write(b"cgone_module\nGoneClass\n)R.")
+        self.assertIsNone(mapcache.load(self.filename, self.cache))
+        with open(mapcache.cache_file(self.filename, self.cache), "wb") as f:
+            f.write(b"ctilemap\nGoneClass\n)R.")
+        self.assertIsNone(mapcache.load(self.filename, self.cache))
+
+    def test_unwritable_cache_is_skipped(self):
+        # A plain file where the cache folder should be
+        with open(self.cache, "wt") as f:
+            f.write("not a folder")
+        game_map = Map(self.filename)
+        self.assertFalse(mapcache.save(self.filename, game_map, TileGrid(game_map.data), (1, 1), self.cache))
+        self.assertIsNone(mapcache.load(self.filename, self.cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
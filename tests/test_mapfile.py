@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+import pygame as pg
+from settings import TILESIZE
+from mapfile import ChunkedMap, convert
+
+
+class TestChunkedMapMethods(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.rows = ["1" * 10] + ["1" + "." * 8 + "1"] * 8 + ["1" * 10]
+        self.rows[3] = "1..p.....1"
+        src = os.path.join(self.folder.name, "map.txt")
+        with open(src, "wt") as f:
+            f.write("\n".join(self.rows) + "\n")
+        dst = os.path.join(self.folder.name, "map.osm")
+        convert(src, dst, chunksize=4)
+        self.map = ChunkedMap(dst, radius=0)
+
+    def tearDown(self):
+        self.map.close()
+        self.folder.cleanup()
+
+    def test_header(self):
+        self.assertEqual((self.map.tilewidth, self.map.tileheight), (10, 10))
+        self.assertEqual((self.map.chunkswide, self.map.chunkshigh), (3, 3))
+        self.assertEqual(self.map.spawn, (3, 3))
+
+    def test_tiles_match_text_map(self):
+        for row, tiles in enumerate(self.rows):
+            for col, tile in enumerate(tiles):
+                self.assertEqual(self.map.is_solid(col, row), tile == "1")
+        self.assertFalse(self.map.is_solid(10, 0))
+
+    def test_read_rows(self):
+        self.assertEqual(self.map.read_rows(), "".join(self.rows).encode("ascii"))
+
+    def test_update_streams_chunks(self):
+        loaded, unloaded = self.map.update(pg.Rect(0, 0, TILESIZE, TILESIZE))
+        self.assertEqual(loaded, {(0, 0)})
+        self.assertEqual(unloaded, set())
+        loaded, unloaded = self.map.update(pg.Rect(9 * TILESIZE, 9 * TILESIZE, TILESIZE, TILESIZE))
+        self.assertEqual(loaded, {(2, 2)})
+        self.assertEqual(unloaded, {(0, 0)})
+        self.assertEqual(list(self.map.chunks), [(2, 2)])
+        # Loaded chunks answer the same as the mapped file
+        self.assertTrue(self.map.is_solid(9, 9))
+        self.assertFalse(self.map.is_solid(8, 8))
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.folder.name, "map.txt")
+        with self.assertRaises(ValueError):
+            ChunkedMap(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import pygame as pg
+from settings import TILESIZE
+from tilemap import TileGrid
+from navigation import FlowField, NavGrid, Navigator
+
+MAP = [
+    "1111111",
+    "1.....1",
+    "1.111.1",
+    "1...1.1",
+    "1111111",
+]
+
+
+def tile_rect(col, row):
+    return pg.Rect(col * TILESIZE, row * TILESIZE, TILESIZE, TILESIZE)
+
+
+class TestNavGridMethods(unittest.TestCase):
+    def setUp(self):
+        self.nav = NavGrid(TileGrid(MAP))
+
+    def test_walkable(self):
+        self.assertTrue(self.nav.is_walkable(1, 1))
+        self.assertFalse(self.nav.is_walkable(0, 0))
+        self.assertFalse(self.nav.is_walkable(-1, 1))
+
+    def test_astar_goes_around_walls(self):
+        path = self.nav.astar((3, 3), (5, 3))
+        self.assertEqual(path[0], (3, 3))
+        self.assertEqual(path[-1], (5, 3))
+        self.assertEqual(len(path), 11)
+        self.assertIsNone(self.nav.astar((1, 1), (0, 0)))
+
+    def test_flow_field_leads_to_target(self):
+        field = FlowField(self.nav, (5, 3))
+        tile = (3, 3)
+        for _ in range(20):
+            dx, dy = field.direction(*tile)
+            if (dx, dy) == (0, 0):
+                break
+            tile = (tile[0] + dx, tile[1] + dy)
+        self.assertEqual(tile, (5, 3))
+        self.assertEqual(field.steps(3, 3), 10)
+
+    def test_flow_field_searches_on_demand(self):
+        field = FlowField(self.nav, (5, 3))
+        self.assertEqual(field.direction(5, 2), (0, 1))
+        self.assertTrue(field.queue)
+        self.assertEqual(field.steps(1, 1), 6)
+        self.assertEqual(field.steps(3, 3), 10)
+        self.assertEqual(field.steps(5, 3), 0)
+        self.assertIsNone(field.steps(2, 2))
+
+    def test_flow_field_radius(self):
+        field = FlowField(self.nav, (5, 3), radius=2)
+        self.assertEqual(field.direction(1, 1), (0, 0))
+        self.assertEqual(field.direction(5, 2), (0, 1))
+
+
+class TestNavigatorMethods(unittest.TestCase):
+    def setUp(self):
+        self.navigator = Navigator(TileGrid(MAP), cache_size=2)
+
+    def test_fields_built_on_demand(self):
+        self.navigator.track(tile_rect(5, 3))
+        self.assertEqual(len(self.navigator.fields), 0)
+        self.assertEqual(self.navigator.direction(tile_rect(5, 1)), (0, 1))
+        field = self.navigator.field
+        # Same tile, same field
+        self.navigator.track(tile_rect(5, 3).move(3, 3))
+        self.navigator.direction(tile_rect(1, 1))
+        self.assertIs(self.navigator.field, field)
+
+    def test_fields_cached_lru(self):
+        for col in (1, 2, 3, 1):
+            self.navigator.track(tile_rect(col, 1))
+            self.navigator.direction(tile_rect(5, 1))
+        self.assertEqual(list(self.navigator.fields), [(3, 1), (1, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
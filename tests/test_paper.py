@@ -1,5 +1,7 @@
 import unittest
 import api.Materials as Materials
+from api.WritingAs import WritingAsTypewriter
+from settings import PAPER_FONT_SIZE
 
 
 class TestPaperMethods(unittest.TestCase):
@@ -33,6 +35,58 @@ class TestPaperMethods(unittest.TestCase):
         self.paper.init()
         self.assertTrue(self.paper.running)
 
+    def test_draw_buffer_rerenders_changed_lines(self):
+        self.paper.init()
+        self.paper.print("first\nsecond")
+        self.paper.draw_buffer()
+        first = self.paper.lines[0][1]
+        second = self.paper.lines[1][1]
+        self.paper.print("first\nsecond line")
+        self.paper.draw_buffer()
+        self.assertIs(self.paper.lines[0][1], first)
+        self.assertIsNot(self.paper.lines[1][1], second)
+
+    def test_draw_buffer_draws_only_typed_characters(self):
+        self.paper.init()
+        writer = WritingAsTypewriter(delay=0.05)
+        self.paper.print("Mother:")
+        self.paper.write("Come home.", writer)
+        atlas = self.paper.atlas(PAPER_FONT_SIZE)
+        drawn = []
+        draw = atlas.draw
+        atlas.draw = lambda surface, text, *args: drawn.append(text) or draw(surface, text, *args)
+        for _ in range(4):
+            writer.update(0.05)
+            self.paper.draw_buffer()
+        self.assertEqual(drawn, ["Mother: C", "", "o", "m", "e"])
+        # Any other change draws the whole line again
+        self.paper.print("Mother: Go\n")
+        self.paper.draw_buffer()
+        self.assertEqual(drawn[-1], "Mother: Go")
+        self.assertEqual(self.paper.lines[0][1].get_size(), atlas.size("Mother: Go"))
+
+    def test_glyph_atlas_matches_font(self):
+        self.paper.init()
+        atlas = self.paper.atlas(24)
+        self.assertIs(self.paper.atlas(24), atlas)
+        self.assertEqual(atlas.size("Only Son")[0], sum(atlas.font.size(c)[0] for c in "Only Son"))
+        # Spaces advance without a blit, characters outside ASCII get their own glyph
+        self.assertEqual(len(atlas.blits("a b\u00e9", 0, 0)), 3)
+        self.assertIn("\u00e9", atlas.extra)
+
+    def test_colours_share_one_atlas(self):
+        self.paper.init()
+        for shade in range(200):
+            self.paper.draw_text("fade", 24, (shade, 0, 0), 0, 0)
+        self.assertEqual(len(self.paper.atlases), 1)
+        self.assertLessEqual(len(self.paper.assets.variants), self.paper.assets.max_variants)
+        atlas = self.paper.atlas(24)
+        red = atlas.tinted((200, 0, 0))
+        area = atlas.areas["A"]
+        solid = max(((x, y) for x in range(area.left, area.right) for y in range(area.height)),
+                    key=lambda pos: atlas.surface.get_at(pos).a)
+        self.assertEqual(red.get_at(solid), (200, 0, 0, atlas.surface.get_at(solid).a))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import unittest
+import pygame as pg
+from assets import Assets
+from perf import FrameStats, Perf
+
+
+class TestFrameStatsMethods(unittest.TestCase):
+    def test_ring_buffer_wraps(self):
+        stats = FrameStats(size=3)
+        for n in range(5):
+            stats.record(n, 0.01 * (n + 1), {"update": 0.001 * n}, n)
+        self.assertEqual(stats.count, 5)
+        self.assertEqual(stats.recent(stats.sprites), [2, 3, 4])
+        self.assertAlmostEqual(stats.mean(stats.frame), 0.04)
+        self.assertAlmostEqual(stats.fps(), 25)
+
+
+class TestPerfMethods(unittest.TestCase):
+    def setUp(self):
+        self.perf = Perf(Assets())
+
+    def record_frames(self, frames):
+        for _ in range(frames):
+            self.perf.begin_frame()
+            for name in ("events", "update", "draw"):
+                self.perf.lap(name)
+            self.perf.end_frame(10)
+
+    def test_overlay_enables_timing(self):
+        self.assertFalse(self.perf.enabled)
+        self.perf.toggle_overlay()
+        self.assertTrue(self.perf.enabled and self.perf.overlay)
+
+    def test_draw_overlay(self):
+        self.record_frames(20)
+        surface = pg.Surface((400, 300))
+        self.perf.draw(surface)
+        self.assertEqual(len(self.perf.lines), 4)
+
+    def test_dump_trace(self):
+        self.record_frames(5)
+        with tempfile.TemporaryDirectory() as folder:
+            filename = self.perf.dump(os.path.join(folder, "trace.json"))
+            with open(filename) as f:
+                events = json.load(f)["traceEvents"]
+        self.assertEqual(len(events), 5 * 4)
+        self.assertEqual({event["name"] for event in events}, {"events", "update", "draw", "sprites"})
+
+
+if __name__ == "__main__":
+    unittest.main()
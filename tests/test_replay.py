@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pygame as pg
+from settings import TICK_RATE
+from main import Game
+import replay
+
+
+class TestReplayMethods(unittest.TestCase):
+    def setUp(self):
+        # Parse the map every time instead of caching it in the repo
+        patcher = mock.patch("main.MAP_CACHE", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.folder = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.folder.name, "session.json")
+        recorder = replay.Recorder(self.filename)
+        game = Game("map.txt", recorder)
+        # Walk right, then down-left, ticking like Game.run does
+        script = [replay.ReplayKeys(2)] * 90 + [replay.ReplayKeys(1 | 8)] * 90
+        ticks = iter(script)
+        game.get_keys = lambda: next(ticks)
+        game.new()
+        for _ in script:
+            game.step(1 / TICK_RATE)
+        recorder.save()
+        self.final = replay.checksum(game)
+        pg.quit()
+
+    def tearDown(self):
+        pg.quit()
+        self.folder.cleanup()
+
+    def test_keys_round_trip(self):
+        keys = replay.ReplayKeys(1 | 8)
+        self.assertTrue(keys[pg.K_LEFT] and keys[pg.K_a] and keys[pg.K_s])
+        self.assertFalse(keys[pg.K_RIGHT] or keys[pg.K_SPACE])
+        self.assertEqual(replay.encode_keys(keys), 9)
+
+    def test_replay_matches_recording(self):
+        recording = replay.load(self.filename)
+        self.assertEqual(len(recording["inputs"]), 180)
+        self.assertEqual(sorted(recording["checksums"]), [60, 120, 180])
+        mismatch, times = replay.replay(recording)
+        self.assertIsNone(mismatch)
+        self.assertEqual(len(times), 180)
+
+    def test_replay_detects_divergence(self):
+        recording = replay.load(self.filename)
+        inputs = bytearray(recording["inputs"])
+        inputs[100] = 4
+        recording["inputs"] = bytes(inputs)
+        mismatch, _ = replay.replay(recording)
+        self.assertEqual(mismatch, 120)
+
+    def test_main_reports_unreadable_recordings(self):
+        recording = replay.load(self.filename)
+        broken = os.path.join(self.folder.name, "broken.json")
+        with open(broken, "wt") as f:
+            json.dump({"version": replay.VERSION, "map_file": recording["map_file"]}, f)
+        for filename in (broken, os.path.join(self.folder.name, "missing.json")):
+            with mock.patch("sys.argv", ["replay.py", filename]), \
+                    mock.patch("builtins.print") as printed:
+                self.assertEqual(replay.main(), 2)
+            self.assertTrue(printed.call_args[0][0].startswith(f"Can't replay {filename}"))
+
+    def test_replay_rejects_changed_map(self):
+        recording = replay.load(self.filename)
+        recording["map_hash"] = "0" * 40
+        with self.assertRaises(ValueError):
+            replay.replay(recording)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import pygame as pg
+from settings import TILESIZE
+from tilemap import Camera, StaticLayer, TileGrid
+
+
+class TestTileGridMethods(unittest.TestCase):
+    def setUp(self):
+        self.grid = TileGrid(["1111", "1..1", "1.p1", "1111"])
+
+    def test_is_solid(self):
+        self.assertTrue(self.grid.is_solid(0, 0))
+        self.assertFalse(self.grid.is_solid(1, 1))
+        self.assertFalse(self.grid.is_solid(2, 2))
+        # Outside the map nothing is solid
+        self.assertFalse(self.grid.is_solid(-1, 0))
+        self.assertFalse(self.grid.is_solid(4, 0))
+
+    def test_collide_only_overlapped_cells(self):
+        rect = pg.Rect(TILESIZE, TILESIZE, TILESIZE, TILESIZE)
+        self.assertEqual(self.grid.collide(rect), [])
+        rect.x -= 1
+        hits = self.grid.collide(rect)
+        self.assertEqual(hits, [pg.Rect(0, TILESIZE, TILESIZE, TILESIZE)])
+
+    def test_collide_map_order(self):
+        # Straddling the top-left corner touches three walls, row by row
+        rect = pg.Rect(TILESIZE - 1, TILESIZE - 1, TILESIZE, TILESIZE)
+        hits = self.grid.collide(rect)
+        self.assertEqual(
+            [(r.x // TILESIZE, r.y // TILESIZE) for r in hits],
+            [(0, 0), (1, 0), (0, 1)],
+        )
+
+
+class TestStaticLayerMethods(unittest.TestCase):
+    def setUp(self):
+        data = ["1" * 10] + ["1" + "." * 8 + "1"] * 8 + ["1" * 10]
+        self.grid = TileGrid(data)
+        tile = pg.Surface((TILESIZE, TILESIZE))
+        tile.fill((0, 255, 0))
+        self.layer = StaticLayer(self.grid, tile, chunksize=4)
+
+    def test_chunks_cover_map(self):
+        # 10x10 tiles in chunks of 4 is 3x3 chunks, the last ones clipped
+        self.assertEqual(len(self.layer.chunks), 9)
+        self.assertEqual(self.layer.chunks[(2, 2)].get_size(), (2 * TILESIZE, 2 * TILESIZE))
+
+    def test_walls_baked(self):
+        chunk = self.layer.chunks[(0, 0)]
+        self.assertEqual(chunk.get_at((TILESIZE // 2, TILESIZE // 2))[:3], (0, 255, 0))
+        self.assertNotEqual(chunk.get_at((TILESIZE * 3 // 2, TILESIZE * 3 // 2))[:3], (0, 255, 0))
+
+    def test_draw_follows_camera(self):
+        screen = pg.Surface((TILESIZE * 2, TILESIZE * 2))
+        camera = Camera(self.grid.tilewidth * TILESIZE, self.grid.tileheight * TILESIZE)
+        camera.camera.topleft = (-TILESIZE, -TILESIZE)
+        self.layer.draw(screen, camera)
+        # The top-left wall is scrolled off, the floor tile next to it is visible
+        self.assertNotEqual(screen.get_at((TILESIZE // 2, TILESIZE // 2))[:3], (0, 255, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from api.WritingAs import WritingAs, WritingAsTypewriter
+
+
+class TestWritingAsTypewriterMethods(unittest.TestCase):
+    def setUp(self):
+        self.replaced = []
+        self.writer = WritingAsTypewriter(delay=0.05)
+        self.writer.play("Mother:", "Come home.", self.replaced.append)
+
+    def test_play_does_not_block(self):
+        self.assertEqual(self.writer.shown, 0)
+        self.assertFalse(self.writer.done)
+        self.assertEqual(self.replaced, [])
+
+    def test_update_reveals_by_time(self):
+        self.assertTrue(self.writer.update(0.12))
+        self.assertEqual(self.replaced, ["Mother: Co\n"])
+        # No new character, no buffer replace
+        self.writer.update(0.01)
+        self.assertEqual(len(self.replaced), 1)
+        self.assertFalse(self.writer.update(1))
+        self.assertEqual(self.replaced[-1], "Mother: Come home.\n")
+
+    def test_fast_forward_and_skip(self):
+        self.writer.fast_forward(4)
+        self.writer.update(0.1)
+        self.assertEqual(self.writer.shown, 8)
+        self.writer.skip()
+        self.assertTrue(self.writer.done)
+        self.assertEqual(self.replaced[-1], "Mother: Come home.\n")
+
+
+class TestWritingAsMethods(unittest.TestCase):
+    def test_play_shows_line_at_once(self):
+        replaced = []
+        writer = WritingAs()
+        self.assertEqual(writer.play("Mother:", "Come home.", replaced.append), "Come home.")
+        self.assertTrue(writer.done)
+        self.assertEqual(replaced, ["Mother: Come home.\n"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,6 +15,96 @@ class Map:
         self.height = self.tileheight * TILESIZE
 
 
+class TileGrid:
+    # Solid tiles indexed by (col, row) so collision only checks the
+    # cells a rect overlaps instead of every wall on the map
+    def __init__(self, data, solid="1"):
+        self.tilewidth = max((len(tiles) for tiles in data), default=0)
+        self.tileheight = len(data)
+        self.cells = bytearray(self.tilewidth * self.tileheight)
+        for row, tiles in enumerate(data):
+            base = row * self.tilewidth
+            for col, tile in enumerate(tiles):
+                if tile in solid:
+                    self.cells[base + col] = 1
+
+    def is_solid(self, col, row):
+        if 0 <= col < self.tilewidth and 0 <= row < self.tileheight:
+            return self.cells[row * self.tilewidth + col] == 1
+        return False
+
+    def tile_rect(self, col, row):
+        return pg.Rect(col * TILESIZE, row * TILESIZE, TILESIZE, TILESIZE)
+
+    def collide(self, rect):
+        # Rects of the solid tiles overlapping rect, in map (row-major) order
+        hits = []
+        if rect.width <= 0 or rect.height <= 0:
+            return hits
+        left = max(rect.left // TILESIZE, 0)
+        right = min((rect.right - 1) // TILESIZE, self.tilewidth - 1)
+        top = max(rect.top // TILESIZE, 0)
+        bottom = min((rect.bottom - 1) // TILESIZE, self.tileheight - 1)
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                if self.is_solid(col, row):
+                    hits.append(self.tile_rect(col, row))
+        return hits
+
+
+class StaticLayer:
+    # Walls and grid lines baked into chunk surfaces once per map load, so
+    # drawing only blits the few chunks the camera can see
+    # With preload off, chunks are baked the first time they come into view
+    # and drop() releases them again, for maps streamed in chunk by chunk.
+    def __init__(self, grid, tile_image, chunksize=CHUNKSIZE, preload=True):
+        self.grid = grid
+        self.tile_image = tile_image
+        self.chunkpixels = chunksize * TILESIZE
+        self.chunksize = chunksize
+        self.chunkswide = -(-grid.tilewidth // chunksize)
+        self.chunkshigh = -(-grid.tileheight // chunksize)
+        self.chunks = {}
+        if preload:
+            for cy in range(self.chunkshigh):
+                for cx in range(self.chunkswide):
+                    self.chunks[(cx, cy)] = self.bake(cx, cy)
+
+    def drop(self, keys):
+        for key in keys:
+            self.chunks.pop(key, None)
+
+    def bake(self, cx, cy):
+        cols = min(self.chunksize, self.grid.tilewidth - cx * self.chunksize)
+        rows = min(self.chunksize, self.grid.tileheight - cy * self.chunksize)
+        width, height = cols * TILESIZE, rows * TILESIZE
+        surface = pg.Surface((width, height))
+        surface.fill(BGCOLOR)
+        for x in range(0, width, TILESIZE):
+            pg.draw.line(surface, LIGHTGREY, (x, 0), (x, height))
+        for y in range(0, height, TILESIZE):
+            pg.draw.line(surface, LIGHTGREY, (0, y), (width, y))
+        for row in range(rows):
+            for col in range(cols):
+                if self.grid.is_solid(cx * self.chunksize + col, cy * self.chunksize + row):
+                    surface.blit(self.tile_image, (col * TILESIZE, row * TILESIZE))
+        return surface
+
+    def draw(self, surface, camera):
+        ox, oy = camera.camera.topleft
+        view = surface.get_rect()
+        left = max(-ox // self.chunkpixels, 0)
+        top = max(-oy // self.chunkpixels, 0)
+        right = min((view.width - ox - 1) // self.chunkpixels, self.chunkswide - 1)
+        bottom = min((view.height - oy - 1) // self.chunkpixels, self.chunkshigh - 1)
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is None:
+                    chunk = self.chunks[(cx, cy)] = self.bake(cx, cy)
+                surface.blit(chunk, (cx * self.chunkpixels + ox, cy * self.chunkpixels + oy))
+
+
 class Camera:
     def __init__(self, width, height):
         self.camera = pg.Rect(0, 0, width, height)
@@ -24,9 +114,15 @@ class Camera:
     def apply(self, entity):
         return entity.rect.move(self.camera.topleft)
 
+    def apply_rect(self, rect):
+        return rect.move(self.camera.topleft)
+
     def update(self, target):
-        x = -target.rect.x + int(WIDTH / 2)
-        y = -target.rect.y + int(HEIGHT / 2)
+        self.follow(target.rect)
+
+    def follow(self, rect):
+        x = -rect.x + int(WIDTH / 2)
+        y = -rect.y + int(HEIGHT / 2)
 
         # limit scrolling to map size
         x = min(0, x)  # Left